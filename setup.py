@@ -11,7 +11,8 @@ setup(
     maintainer_email='jladan@physics.utoronto.ca',
     # Package info
     packages=find_packages(),
-    install_requires=['numpy', 'scipy', 'PyQt5'],
+    python_requires='>=3.6',
+    install_requires=['numpy', 'scipy', 'PyQt5>=5.14'],
     package_data={
         "": ["README.md", '*.png']
     },
@@ -26,21 +26,14 @@ def _createXYArrays(markerList):
     corrsponding y-coordinates.
     """
 
-    # initialize two numpy arrays whose lengths are equal to the number of
-    # markers in markerList
-    xArray = np.zeros(markerList.count())
-    yArray = np.zeros(markerList.count())
-
-    # loop over each marker, setting the x-coordinate of each marker as an
-    # element of xArray and each y-coordinate as an element of yArray
-    for row in range(markerList.count()):
-        marker = markerList.item(row)
-        # using 64 bit floats seems to be necessary to ensure consistent
-        # results across all systems. Some systems get the same results
-        # with or without np.float64() but others don't. When using
-        # float64, results match for all systems tested.
-        xArray[row] = np.float64(marker.ellipse.rect().center().x())
-        yArray[row] = np.float64(marker.ellipse.rect().center().y())
+    # copy the coordinates the marker list keeps in arrays, so that the fit
+    # doesn't go through the markers one at a time.
+    # using 64 bit floats seems to be necessary to ensure consistent
+    # results across all systems. Some systems get the same results
+    # with or without np.float64() but others don't. When using
+    # float64, results match for all systems tested.
+    xArray = np.array(markerList.xs, dtype=np.float64)
+    yArray = np.array(markerList.ys, dtype=np.float64)
 
     return xArray, yArray
 
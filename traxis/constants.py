@@ -57,3 +57,18 @@ ZOOMOUTFACTOR = 1/ZOOMINFACTOR
 # default GUI state variables
 DEFAULTPOINTSIZE = 10
 DEFAULTLINEWIDTH = 2.5
+
+# delay before a new dL typed in the dL text box is applied to the momentum
+# arc, so that only the final value is drawn while typing
+DLEDITDELAY = 30 # in ms
+
+# minimum time between redraws of the angle reference line while it follows
+# the mouse (about one frame at 60 Hz)
+REFLINEREDRAWINTERVAL = 16 # in ms
+
+# draw the graphics view with OpenGL (needs a working OpenGL driver)
+USEOPENGLVIEWPORT = False
+
+# maximum number of lines kept in the console. The oldest lines are dropped
+# once it is full.
+CONSOLEMAXLINES = 2000
@@ -62,13 +62,9 @@ class ReferenceLine(object):
         # Force integer for Qt5 compatibility
         width = int(width)
 
-        # create a rect for the initial point with the given
-        # coordinates and size (set the width and height of the rect to size)
-        initialRect = QtCore.QRectF(x, y, size, size)
-        # when instantiating a rect, the given coordinates are used for the
-        # top-left corner so we must explicitly move the rect's center to the
-        # desired coordinates
-        initialRect.moveCenter(QtCore.QPointF(x, y))
+        # create a rect for the initial point centered on the given
+        # coordinates, with width and height size
+        initialRect = _centeredRect(x, y, size)
         # create a QGraphicsEllipseItem using the rect created above. Set it
         # as the reference line's initialPoint attribute.
         self.initialPoint = QtWidgets.QGraphicsEllipseItem(initialRect)
@@ -98,13 +94,9 @@ class ReferenceLine(object):
             width = 1
         width = int(width)
 
-        # create a rect for the final point with the given
-        # coordinates and size (set the width and height of the rect to size)
-        finalRect = QtCore.QRectF(x, y, size, size)
-        # when instantiating a rect, the given coordinates are used for the
-        # top-left corner so we must explicitly move the rect's center to the
-        # desired coordinates
-        finalRect.moveCenter(QtCore.QPointF(x, y))
+        # create a rect for the final point centered on the given
+        # coordinates, with width and height size
+        finalRect = _centeredRect(x, y, size)
         # create a QGraphicsEllipseItem using the rect created above. Set it
         # as the reference line's finalPoint attribute.
         self.finalPoint = QtWidgets.QGraphicsEllipseItem(finalRect)
@@ -125,38 +117,39 @@ class ReferenceLine(object):
             self.reset()
 
     def drawLine(self, endX, endY, width, scene):
-        """First, remove the existing line item, if any, from the graphics
-        scene. Then create a new line item whose start point coordinates are
-        the coordinates of initialPoint, whose end point coordinates are
-        (endX, endY), and with pen width width. Add the newly created line
-        to scene, a QGraphicsScene. 
+        """Draw the line from the center of initialPoint to (endX, endY), with
+        pen width width. The first time, a line item is created and added to
+        scene, a QGraphicsScene. After that, the same line item is moved to
+        the new end point, since this is called repeatedly while the line
+        follows the mouse.
         """
 
-        # if this reference line already has a line attribute, remove it from
-        # the graphics scene
-        if self.line:
-            scene.removeItem(self.line)
-
         # set a minimum pen width
         if width < 1:
             width = 1
         width = int(width)
 
-        # create a QGraphicsLineItem with the appropriate start and end
-        # coordinates
-        startX = self.initialPoint.rect().center().x()
-        startY = self.initialPoint.rect().center().y()
-        self.line = QtWidgets.QGraphicsLineItem(startX, startY, endX, endY)
-
-        # create a pen for the line using the reference line colour
-        linePen = QtGui.QPen(constants.REFLINECOLOR)
-        # set the width of the pen to width
-        linePen.setWidth(width)
-        # set the newly created pen as the line's pen
-        self.line.setPen(linePen)
-
-        # add the line to the graphics scene
-        scene.addItem(self.line)
+        # if this reference line has no line item yet, create one and add it
+        # to the graphics scene
+        if not self.line:
+            self.line = QtWidgets.QGraphicsLineItem()
+            # create a pen for the line using the reference line colour
+            linePen = QtGui.QPen(constants.REFLINECOLOR)
+            # set the width of the pen to width
+            linePen.setWidth(width)
+            # set the newly created pen as the line's pen
+            self.line.setPen(linePen)
+            # add the line to the graphics scene
+            scene.addItem(self.line)
+        # otherwise, only update the line's pen if its width has changed
+        elif self.line.pen().width() != width:
+            linePen = self.line.pen()
+            linePen.setWidth(width)
+            self.line.setPen(linePen)
+
+        # set the line's start and end coordinates
+        start = self.initialPoint.rect().center()
+        self.line.setLine(start.x(), start.y(), endX, endY)
 
     def rescale(self, size, width):
         """Set the size of the initial and final point to size and set the pen
@@ -174,15 +167,10 @@ class ReferenceLine(object):
 
         # if the initialPoint attribute is not None
         if self.initialPoint:
-            # create a new rect, starting from the existing rect of the initial
-            # point
-            newInitialRect = self.initialPoint.rect()
-            # set the width and height of the new rect
-            newInitialRect.setWidth(size)
-            newInitialRect.setHeight(size)
-            # move the rect's center to match that of the original rect's (the
-            # center gets shifted when resizing)
-            newInitialRect.moveCenter(self.initialPoint.rect().center())
+            # create a new rect of the new size, with the same center as the
+            # existing rect of the initial point
+            center = self.initialPoint.rect().center()
+            newInitialRect = _centeredRect(center.x(), center.y(), size)
             # set the resized rect as the initial point's rect
             self.initialPoint.setRect(newInitialRect)
 
@@ -196,15 +184,10 @@ class ReferenceLine(object):
 
         # if the finalPoint attribute is not None
         if self.finalPoint:
-            # create a new rect, starting from the existing rect of the final
-            # point
-            newFinalRect = self.finalPoint.rect()
-            # set the width and height of the new rect
-            newFinalRect.setWidth(size)
-            newFinalRect.setHeight(size)
-            # move the rect's center to match that of the original rect's (the
-            # center gets shifted when resizing)
-            newFinalRect.moveCenter(self.finalPoint.rect().center())
+            # create a new rect of the new size, with the same center as the
+            # existing rect of the final point
+            center = self.finalPoint.rect().center()
+            newFinalRect = _centeredRect(center.x(), center.y(), size)
             # set the resized rect as the final point's rect
             self.finalPoint.setRect(newFinalRect)
 
@@ -252,3 +235,7 @@ class ReferenceLine(object):
         self.initialPoint = None
         self.finalPoint = None
         self.line = None
+
+def _centeredRect(x, y, size):
+    """Return a square QRectF with sides of length size, centered on (x, y)."""
+    return QtCore.QRectF(x - size / 2, y - size / 2, size, size)
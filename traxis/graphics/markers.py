@@ -15,22 +15,116 @@
 # You should have received a copy of the GNU General Public License
 # along with traxis.  If not, see <http://www.gnu.org/licenses/>.
 
+import enum
+import math
+import numpy as np
 from PyQt5 import QtWidgets, QtGui, QtCore
 from traxis import constants
 
 
+class Designation(enum.IntEnum):
+    """Designation of a track marker, as stored in MarkerList.designations."""
+    NONE = 0
+    START = 1
+    END = 2
+
+# designations by label, for the string API of TrackMarker.setDesignation
+_DESIGNATIONS = {None: Designation.NONE,
+                 'start': Designation.START,
+                 'end': Designation.END}
+# labels by designation, as written in saved sessions
+_DESIGNATIONLABELS = {code: label for label, code in _DESIGNATIONS.items()}
+# prefixes indicating the marker designations in the displayed names
+_DESIGNATIONPREFIXES = {Designation.NONE: "",
+                        Designation.START: "s - ",
+                        Designation.END: "e - "}
+
+
 class MarkerList(QtWidgets.QListWidget):
     """Track Marker list class.
 
     This class is intended to contain TrackMarker objects, and implements a
     number of methods to work with the extra features that TrackMarker adds to
-    QListWidgetItem.
+    QListWidgetItem. The markers themselves are drawn by a single
+    MarkersOverlayItem owned by the list.
+
+    The marker coordinates and designations are also stored as numpy
+    arrays (one entry per row), so that operations on all the markers don't
+    have to go through the list items one at a time.
+
+    Markers are found through the list, never by position in the scene, so
+    attaching a scene switches off its BSP item index (see attachScene()).
+    Positional lookups such as scene.itemAt() still work on that scene, but
+    search through every item.
     """
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # the arrays are allocated with spare capacity, and only the first
+        # self._count entries are in use
+        self._count = 0
+        self._xs = np.zeros(16, dtype=np.float64)
+        self._ys = np.zeros(16, dtype=np.float64)
+        self._des = np.zeros(16, dtype=np.int8)
+        # the id given to the next marker. Ids are not reused until the list
+        # is emptied.
+        self._nextId = 1
+        self._overlay = MarkersOverlayItem(self)
+        # the scene the overlay was added to by attachScene(), if any
+        self._scene = None
+
+        # the markers designated as the start and end points, if any
+        self._startPoint = None
+        self._endPoint = None
+
+        # the rows that were selected at the last recolour
+        self._highlightedRows = []
+        # recolours are applied once control returns to the event loop, so
+        # that a burst of them only updates the overlay once
+        self._recolorTimer = QtCore.QTimer(self)
+        self._recolorTimer.setSingleShot(True)
+        self._recolorTimer.setInterval(0)
+        self._recolorTimer.timeout.connect(self._applyRecolor)
+
+    @property
+    def xs(self):
+        """Array of the x-coordinates of the markers, in list order."""
+        return self._xs[:self._count]
+
+    @property
+    def ys(self):
+        """Array of the y-coordinates of the markers, in list order."""
+        return self._ys[:self._count]
+
+    @property
+    def designations(self):
+        """Array of the designation codes of the markers, in list order."""
+        return self._des[:self._count]
+
+    def points(self):
+        """Return the markers as a list of (x, y, designation) tuples, in list
+        order, with the designations given by their labels ('start', 'end' or
+        None). This is the inverse of addMarkersBulk(), and is read from the
+        arrays without going through the list items.
+        """
+        labels = [_DESIGNATIONLABELS[code] for code in self.designations.tolist()]
+        return list(zip(self.xs.tolist(), self.ys.tolist(), labels))
+
+    def attachScene(self, scene):
+        """Draw the markers on scene, a QGraphicsScene.
 
-    def addMarker(self, x, y, size, width, scene):
+        The scene's item index is switched off, since keeping it up to date
+        as markers are moved is wasted work when nothing looks items up by
+        position.
+        """
+        # all markers are drawn by the overlay, which only needs adding once
+        if self._scene is scene:
+            return
+        scene.setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex)
+        scene.addItem(self._overlay)
+        self._scene = scene
+
+    def addMarker(self, x, y, scene):
         """Create a new TrackMarker and add it to the list.
 
         The marker is created with this list as its parent, and is drawn to the
@@ -39,122 +133,376 @@ class MarkerList(QtWidgets.QListWidget):
         Parameters
         ----------
         x, y  : (floats) marker coordinates
-        size  : size of ellipse to draw
-        width : pen width
         scene : the QGraphicsScene to draw the marker on.
 
         Returns
         -------
         the TrackMarker object.
         """
-        # use the last item in the list to determine the new marker's id
-        lastItem = self.item(self.count()-1)
-        if lastItem:
-            newMarkerId = lastItem.id + 1
-        else:
-            newMarkerId = 1
-
-        newMarker = TrackMarker(newMarkerId, x, y, size, width, self)
+        self.attachScene(scene)
+        newMarker = self._appendMarker(x, y)
+        self._overlay.refresh()
         self.setCurrentItem(newMarker)
-        scene.addItem(newMarker.ellipse)
 
         return newMarker
 
+    def addMarkersBulk(self, points, scene):
+        """Create a TrackMarker for each point and add them to the list.
+
+        This does the same as calling addMarker() and setDesignation() for
+        each point, but the list isn't repainted and doesn't emit signals until
+        all the markers have been added, and the overlay is only updated once.
+
+        Parameters
+        ----------
+        points : iterable of (x, y, designation) tuples
+        scene  : the QGraphicsScene to draw the markers on.
+
+        Returns
+        -------
+        list of the new TrackMarker objects.
+        """
+        # the previous states are restored afterwards, in case the caller is
+        # already holding back updates or signals
+        updatesEnabled = self.updatesEnabled()
+        self.setUpdatesEnabled(False)
+        signalsBlocked = self.blockSignals(True)
+        try:
+            newMarkers = []
+            for x, y, designation in points:
+                newMarker = self._appendMarker(x, y)
+                if designation:
+                    newMarker.setDesignation(designation)
+                newMarkers.append(newMarker)
+        finally:
+            self.blockSignals(signalsBlocked)
+            self.setUpdatesEnabled(updatesEnabled)
+
+        self.attachScene(scene)
+        self._overlay.refresh()
+        if newMarkers:
+            self.setCurrentItem(newMarkers[-1])
+
+        return newMarkers
+
     def deleteMarker(self, marker):
         """Remove the TrackMarker object marker from this marker list."""
-        # remove the marker's ellipse from its graphics scene
-        marker.ellipse.scene().removeItem(marker.ellipse)
+        if marker is self._startPoint:
+            self._startPoint = None
+        if marker is self._endPoint:
+            self._endPoint = None
 
         markerRow = self.row(marker)
+
+        # shift the following markers down a row in the arrays
+        n = self._count
+        for column in (self._xs, self._ys, self._des):
+            column[markerRow:n-1] = column[markerRow+1:n]
+        self._count -= 1
+        self._overlay.refresh()
+
         self.takeItem(markerRow)
 
     def empty(self):
         """Remove all TrackMarker objects from this marker list."""
-        # First remove the markers from the scene
-        for row in range(self.count()):
-            marker = self.item(row)
-            marker.ellipse.scene().removeItem(marker.ellipse)
-        # now it's safe to clear the list
+        self._count = 0
+        self._nextId = 1
+        self._startPoint = None
+        self._endPoint = None
+        self._overlay.refresh()
+        # take the whole overlay off the scene in one call; addMarker() puts
+        # it back with the next marker
+        if self._scene:
+            self._scene.removeItem(self._overlay)
+            self._scene = None
         self.clear()
 
-    def rescale(self, size, width):
-        """Set the size of each marker's circle.
-
-        Parameters
-        size  : the circle's diameter
-        width : the pen width
-        """
-        for row in range(self.count()):
-            marker = self.item(row)
-            marker.rescale(size, width)
-
     def setStartPoint(self, marker):
         """Designate marker as the start point."""
         # Clear the old startpoint's designation
-        oldStartPoint = self.getStartPoint()
+        oldStartPoint = self._startPoint
         if oldStartPoint:
             oldStartPoint.setDesignation()
-            oldStartPoint.recolor()
 
         # designate marker as the new start point
-        marker.setDesignation('start')
+        marker.setDesignation(Designation.START)
 
     def setEndPoint(self, marker):
         """Designate marker as the end point for this list of markers."""
         # Clear the old startpoint's designation
-        oldEndPoint = self.getEndPoint()
+        oldEndPoint = self._endPoint
         if oldEndPoint:
             oldEndPoint.setDesignation()
-            oldEndPoint.recolor()
 
         # designate marker as the new start point
-        marker.setDesignation('end')
+        marker.setDesignation(Designation.END)
 
     def getStartPoint(self):
         """Return the TrackMarker object designated as the start point
 
         If no TrackMarker is designated as the start, return None.
         """
-        for row in range(self.count()):
-            marker = self.item(row)
-            if marker.designation == 'start':
-                return marker
-        return None
+        return self._startPoint
 
     def getEndPoint(self):
         """Return the TrackMarker object designated as the end point
 
         If no TrackMarker is designated as the end, return None.
         """
-        for row in range(self.count()):
-            marker = self.item(row)
-            if marker.designation == 'end':
-                return marker
-        return None
+        return self._endPoint
+
+    def getAngles(self, origin, referenceMarker=None):
+        """Return the angular coordinates of all the markers.
+
+        This is the vectorized equivalent of calling TrackMarker.getAngle()
+        on every marker in the list.
+
+        Parameters:
+        origin          : a tuple of x, and y values for the origin.
+        referenceMarker : another marker to use as an angle reference with the origin
+
+        Returns:
+        angles : numpy array of the markers' angles in degrees, in list order.
+                 Angles are measured counter-clockwise (y values increase going
+                 down), from the x-axis or from the line connecting the origin
+                 to the reference marker.
+        """
+        angles = np.degrees(np.arctan2(origin[1] - self.ys, self.xs - origin[0]))
+        if referenceMarker:
+            angles -= np.degrees(np.arctan2(origin[1] - referenceMarker.y,
+                                            referenceMarker.x - origin[0]))
+        return angles % 360
 
     def highlightCurrent(self):
         """Change all markers to their correct colour."""
-        for row in range(self.count()):
-            marker = self.item(row)
-            marker.recolor()
+        # the highlight is resolved from the selection when the overlay is
+        # painted, so a repaint is all that is needed
+        selectedRows = sorted(self.row(item) for item in self.selectedItems())
+        if selectedRows == self._highlightedRows:
+            return
+        self._highlightedRows = selectedRows
+        # repaint on the next pass of the event loop, unless a repaint is
+        # already pending
+        if not self._recolorTimer.isActive():
+            self._recolorTimer.start()
 
     def selectNext(self):
         """Set the currently selected marker to the next marker in the list."""
-        # if there are no markers selected (currentRow() == -1) or if the
-        # currently selected marker is the last one in the list, return
-        if self.currentRow() == -1 or self.currentRow() == self.count() - 1:
-            return
-        else:
-            self.setCurrentRow(self.currentRow() + 1)
+        # do nothing if there are no markers selected (currentRow() == -1) or
+        # if the currently selected marker is the last one in the list
+        row = self.currentRow()
+        if 0 <= row < self.count() - 1:
+            self.setCurrentRow(row + 1)
 
     def selectPrevious(self):
         """Set the currently selected marker to the previous marker in the list."""
-        # if there are no markers selected (currentRow() == -1) or if the
-        # currently selected marker is the first one in the list, return
-        if self.currentRow() == -1 or self.currentRow() == 0:
+        # do nothing if there are no markers selected (currentRow() == -1) or
+        # if the currently selected marker is the first one in the list
+        row = self.currentRow()
+        if row > 0:
+            self.setCurrentRow(row - 1)
+
+    def _appendMarker(self, x, y):
+        """Create a new TrackMarker at the end of the list and return it.
+
+        The overlay is not updated; that is left to the caller.
+        """
+        row = self._count
+        newMarkerId = self._nextId
+        self._nextId += 1
+
+        # grow the arrays geometrically when they are full
+        if row == len(self._xs):
+            self._xs, self._ys, self._des = [
+                np.resize(column, 2 * len(column)) for column in
+                (self._xs, self._ys, self._des)]
+        self._xs[row] = x
+        self._ys[row] = y
+        self._des[row] = Designation.NONE
+        self._count += 1
+
+        return TrackMarker(newMarkerId, x, y, self)
+
+    @QtCore.pyqtSlot()
+    def _applyRecolor(self):
+        """Repaint the overlay, so the markers take their new colours."""
+        self._overlay.update()
+
+    def _designationChanged(self, marker):
+        """Keep track of the start and end points when the designation of
+        marker has changed.
+        """
+        if marker.designation == Designation.START:
+            self._startPoint = marker
+        elif marker is self._startPoint:
+            self._startPoint = None
+
+        if marker.designation == Designation.END:
+            self._endPoint = marker
+        elif marker is self._endPoint:
+            self._endPoint = None
+
+        self._updateMarker(marker)
+
+    def _updateMarker(self, marker):
+        """Copy the coordinates and designation of marker into the arrays.
+
+        The overlay is only updated if something has changed.
+        """
+        row = self.row(marker)
+        code = marker.designation
+        if self._xs[row] != marker.x or self._ys[row] != marker.y:
+            self._xs[row] = marker.x
+            self._ys[row] = marker.y
+            self._des[row] = code
+            self._overlay.refresh()
+        elif self._des[row] != code:
+            # only the colour has changed, so the bounds are still valid
+            self._des[row] = code
+            self._overlay.update()
+
+class MarkersOverlayItem(QtWidgets.QGraphicsItem):
+    """Graphics item that draws all the markers of a MarkerList.
+
+    Rather than adding a QGraphicsEllipseItem per marker to the scene, the
+    overlay draws every marker of the list in a single paint call, with one
+    pen per colour. The colour of each marker comes from its designation code,
+    and selected markers are highlighted when painting, so changing the
+    selection only requires a repaint.
+
+    Like an item with the ItemIgnoresTransformations flag, the markers keep
+    the same size on screen whatever the zoom: their size and pen width are
+    in device pixels, so the overlay doesn't need rescaling when the view is
+    zoomed.
+    """
+
+    # the colour tags are the designation codes of MarkerList, plus one for
+    # the selected markers. COLORS is indexed by tag.
+    HIGHLIGHT = len(Designation)
+    COLORS = (constants.DEFAULTMARKERCOLOR,
+              constants.STARTMARKERCOLOR,
+              constants.ENDMARKERCOLOR,
+              constants.HIGHLIGHTMARKERCOLOR)
+
+    def __init__(self, markerList, size=constants.DEFAULTPOINTSIZE,
+                 width=constants.DEFAULTLINEWIDTH):
+        """ Create an overlay for the markers of markerList.
+
+        Parameters:
+        markerList : the MarkerList whose markers are drawn,
+        size       : (float) the diameter of the marker circles in pixels,
+        width      : (float) the width of the pen used to draw the markers.
+        """
+        super().__init__()
+        self.markerList = markerList
+        self._bounds = QtCore.QRectF()
+        self._size = 2
+        self._width = 1
+        # the scale of the view (device pixels per scene unit) the markers
+        # were last painted at, which the bounds depend on
+        self._scale = 1
+        # one pen per colour tag, shared by all the markers with that tag
+        self._pens = [QtGui.QPen(color) for color in self.COLORS]
+        # pre-rendered marker pixmaps, keyed by colour tag and the device
+        # pixel ratio of the screen they were rendered for
+        self._pixmaps = {}
+        self.rescale(size, width)
+
+    def boundingRect(self):
+        return self._bounds
+
+    def paint(self, painter, option, widget=None):
+        """Draw every marker, grouping them by colour.
+
+        Each marker is drawn by copying a pre-rendered pixmap of its circle,
+        rather than stroking an ellipse every time.
+        """
+        xs = self.markerList.xs
+        ys = self.markerList.ys
+        tags = self.markerList.designations.copy()
+        for item in self.markerList.selectedItems():
+            tags[self.markerList.row(item)] = self.HIGHLIGHT
+
+        scale = option.levelOfDetailFromTransform(painter.worldTransform())
+        if scale != self._scale:
+            # the view was zoomed, so the markers take up a different area of
+            # the scene. Update the bounds once painting is done.
+            self._scale = scale
+            QtCore.QTimer.singleShot(0, self.refresh)
+
+        # device pixels per logical pixel of the screen being painted on (more
+        # than 1 on HiDPI screens)
+        deviceRatio = painter.device().devicePixelRatioF()
+
+        for tag in range(len(self._pens)):
+            rows = np.flatnonzero(tags == tag)
+            if not rows.size:
+                continue
+            pixmap = self._markerPixmap(tag, scale, deviceRatio)
+            # offset from the marker's center to the pixmap's top-left corner
+            offset = pixmap.width() / pixmap.devicePixelRatio() / 2
+            for x, y in zip(xs[rows], ys[rows]):
+                painter.drawPixmap(QtCore.QPointF(x - offset, y - offset), pixmap)
+
+    def refresh(self):
+        """Update the overlay after the markers have changed."""
+        self.prepareGeometryChange()
+        xs = self.markerList.xs
+        ys = self.markerList.ys
+        if not xs.size:
+            self._bounds = QtCore.QRectF()
             return
-        else:
-            self.setCurrentRow(self.currentRow() - 1)
+        # leave room for the circles and the pen around the centers
+        margin = (self._size / 2 + self._width) / self._scale
+        left, top = xs.min() - margin, ys.min() - margin
+        self._bounds = QtCore.QRectF(left, top,
+                                     xs.max() + margin - left,
+                                     ys.max() + margin - top)
+
+    def rescale(self, size, width):
+        """Set the diameter and pen width of the marker circles, in pixels."""
+        # set a minimum circle size
+        if size < 2:
+            size = 2
+        # set a minimum pen width
+        if width < 1:
+            width = 1
+        self._size = size
+        self._width = int(width)
+        for pen in self._pens:
+            pen.setWidth(self._width)
+        self._pixmaps.clear()
+        self.refresh()
+
+    def _markerPixmap(self, tag, scale, deviceRatio):
+        """Return a pixmap of a marker circle with the given colour tag.
+
+        The pixmap is rendered in the screen's device pixels (deviceRatio per
+        logical pixel), so that the markers stay sharp on HiDPI screens, and
+        is cached until the next rescale. Its device pixel ratio is set to
+        scale * deviceRatio, the number of device pixels per scene unit, so
+        that it is drawn at the same size on screen at any zoom.
+        """
+        key = (tag, deviceRatio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            # size of the pixmap in logical pixels
+            side = math.ceil(self._size + self._width)
+            pixmap = QtGui.QPixmap(math.ceil(side * deviceRatio),
+                                   math.ceil(side * deviceRatio))
+            pixmap.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(pixmap)
+            # draw in logical pixels
+            painter.scale(deviceRatio, deviceRatio)
+            painter.setPen(self._pens[tag])
+            painter.drawEllipse(QtCore.QPointF(side / 2, side / 2),
+                                self._size / 2, self._size / 2)
+            painter.end()
+            self._pixmaps[key] = pixmap
+        ratio = scale * deviceRatio
+        if pixmap.devicePixelRatio() != ratio:
+            pixmap.setDevicePixelRatio(ratio)
+        return pixmap
 
 class TrackMarker(QtWidgets.QListWidgetItem):
     """Track marker class.
@@ -164,10 +512,17 @@ class TrackMarker(QtWidgets.QListWidgetItem):
        - displayed name
        - designation (start, end, selected, or none),
        - coordinates
-       - QGraphicsEllipseItem
+
+    The marker is drawn by the MarkersOverlayItem of the list it belongs to,
+    and the list keeps a copy of its coordinates and designation. Use move()
+    and setDesignation() to change them, so that the copy stays in sync.
     """
 
-    def __init__(self, markerId, x, y, size, width, parent=None):
+    # The sip wrapper still provides a __dict__, but these attributes are
+    # kept in slots so that no per-marker dict gets created.
+    __slots__ = ('id', 'x', 'y', 'designation')
+
+    def __init__(self, markerId, x, y, parent=None):
         """ Create a new marker.
 
         It is up to the caller to ensure the markerId is unique. This is
@@ -176,97 +531,49 @@ class TrackMarker(QtWidgets.QListWidgetItem):
         Parameters:
         markerId    : identifier for the marker,
         x, y        : (float) x and y coordinates,
-        size        : (float) the size of the marker,
-        width       : (float) the width of the pen used to draw the marker,
         parent      : (optional) MarkerList to which the marker will be added.
         """
         self.id = markerId
-        self._x = x
-        self._y = y
+        self.x = x
+        self.y = y
 
-        self.designation = None
-        markerName = "Point {}".format(self.id)
+        self.designation = Designation.NONE
 
-        super().__init__(markerName, parent)
-
-        # set a minimum rect size
-        if size < 2:
-            size = 2
-
-        # set a minimum pen width
-        if width < 1:
-            width = 1
-        width = int(width)
-
-        # create the ellipse to be drawn as the marker
-        ellipsePen = QtGui.QPen(constants.DEFAULTMARKERCOLOR)
-        ellipsePen.setWidth(width)
-        ellipseRect = QtCore.QRectF(x, y, size, size)
-        ellipseRect.moveCenter(QtCore.QPointF(x, y))
-
-        self.ellipse = QtWidgets.QGraphicsEllipseItem(ellipseRect)
-        self.ellipse.setPen(ellipsePen)
-
-    @property
-    def x(self):
-        return self._x
-    @x.setter
-    def x(self, value):
-        self._x = value
-
-    @property
-    def y(self):
-        return self._y
-    @y.setter
-    def y(self, value):
-        self._y = value
+        super().__init__(f"Point {self.id}", parent)
 
     def setDesignation(self, designation=None):
         """Indicate the marker as a Start Point, an End Point or neither, as
-        specified by designation (a string).
+        specified by designation (a Designation, or one of the labels 'start',
+        'end' or None).
         """
-        if designation not in [None, 'start', 'end']:
+        if designation in _DESIGNATIONS:
+            designation = _DESIGNATIONS[designation]
+        elif designation in _DESIGNATIONPREFIXES:
+            designation = Designation(designation)
+        else:
+            return
+        if designation == self.designation:
             return
 
         self.designation = designation
 
         # indicate the designation in the displayed name
-        if designation == 'start':
-            self.setText("s - Point {}".format(self.id))
-        elif designation == 'end':
-            self.setText("e - Point {}".format(self.id))
-        else:
-            self.setText("Point {}".format(self.id))
+        self.setText(f"{_DESIGNATIONPREFIXES[designation]}Point {self.id}")
 
-    def recolor(self):
-        """Update the colour of the marker based on its designation or whether
-        it is currently selected.
-        """
-        newPen = self.ellipse.pen()
-
-        # Set the pen's colour based on the designation
-        if self.isSelected():
-            newPen.setColor(constants.HIGHLIGHTMARKERCOLOR)
-        elif self.designation == 'start':
-            newPen.setColor(constants.STARTMARKERCOLOR)
-        elif self.designation == 'end':
-            newPen.setColor(constants.ENDMARKERCOLOR)
-        else:
-            newPen.setColor(constants.DEFAULTMARKERCOLOR)
-
-        self.ellipse.setPen(newPen)
+        markerList = self.listWidget()
+        if markerList:
+            markerList._designationChanged(self)
 
     def move(self, dx, dy):
         """Move the marker from its current position (x, y) to (x+dx, y+dy).
         dx and dy are floats.
         """
-        # create a new rect, starting from the existing rect of the marker's
-        # ellipse
-        newRect = self.ellipse.rect()
-        # translate the rect by (dx, dy)
-        newRect.translate(dx, dy)
-        # set the translated rect as the marker's ellipse's rect
-        self.ellipse.setRect(newRect)
+        self.x += dx
+        self.y += dy
+
+        markerList = self.listWidget()
+        if markerList:
+            markerList._updateMarker(self)
 
     def getAngle(self, origin, referenceMarker=None):
         """Return the marker's angular coordinate.
@@ -278,9 +585,10 @@ class TrackMarker(QtWidgets.QListWidgetItem):
         Returns:
         angle : The marker's angle in polar coordinates using the origin, or
                 relative to the line connecting the origin to tyhe reference marker.
-        """
-        markerVector = QtCore.QLineF(origin[0], origin[1], self.x, self.y)
 
+        To get the angles of many markers, MarkerList.getAngles() is much
+        faster than calling this for each marker.
+        """
         # define the the vector to measure the angle from
         if referenceMarker:
             referenceX = referenceMarker.x
@@ -288,31 +596,12 @@ class TrackMarker(QtWidgets.QListWidgetItem):
         else:
             referenceX = origin[0] + 1
             referenceY = origin[1]
-        referenceVector = QtCore.QLineF(origin[0], origin[1], referenceX, referenceY)
 
-        # compute the angular coordinate of the marker
-        angle = referenceVector.angleTo(markerVector)
+        # compute the angular coordinate of the marker, counter-clockwise from
+        # the reference vector. y values increase going down, so they are
+        # flipped, as QLineF.angleTo() would.
+        markerAngle = math.atan2(origin[1] - self.y, self.x - origin[0])
+        referenceAngle = math.atan2(origin[1] - referenceY, referenceX - origin[0])
+        angle = math.degrees(markerAngle - referenceAngle) % 360
 
         return angle
-
-    def rescale(self, size, width):
-        """Set the radius and penwidth of the marker's circle."""
-        if size < 2:
-            size = 2
-        if width < 1:
-            width = 1
-        width = int(width)
-
-        # Make the new circle by updating ellipse's rectangle
-        newRect = self.ellipse.rect()
-        newRect.setWidth(size)
-        newRect.setHeight(size)
-        # move the rect's center to match that of the original rect's (the
-        # center gets shifted when resizing)
-        newRect.moveCenter(self.ellipse.rect().center())
-        self.ellipse.setRect(newRect)
-
-        # Set the circle's penwidth
-        newPen = self.ellipse.pen()
-        newPen.setWidth(width)
-        self.ellipse.setPen(newPen)
@@ -17,13 +17,14 @@
 # You should have received a copy of the GNU General Public License
 # along with traxis.  If not, see <http://www.gnu.org/licenses/>.
 
-import json
+import contextlib
 import math
 from PyQt5 import QtWidgets, QtGui, QtCore
 from traxis import constants
-from traxis.gui import skeleton
-from traxis.calc import anglecalc, circlefit, optdensity
-from traxis.graphics import tangent
+from traxis.gui import skeleton, tasks
+
+# conversion factor from degrees to radians
+_DEG2RAD = math.pi / 180
 
 
 class MainWidget(skeleton.GuiSkeleton):
@@ -46,6 +47,26 @@ class MainWidget(skeleton.GuiSkeleton):
         self.pointSize = constants.DEFAULTPOINTSIZE
         self.lineWidth = constants.DEFAULTLINEWIDTH
         self.imageFileName = None
+        # the marker coordinates self.fittedCircle was fitted to
+        self._fitKey = None
+
+        # the dL as a float, kept up to date with the dL text box (0 if the
+        # text box doesn't hold a number)
+        self._dl = 0.
+        # timer used to apply the latest edit of the dL text box after a
+        # short delay (see dLEdited)
+        self._dlTimer = QtCore.QTimer(self)
+        self._dlTimer.setSingleShot(True)
+        self._dlTimer.setInterval(constants.DLEDITDELAY)
+        self._dlTimer.timeout.connect(self._applyPendingDL)
+
+        # timer used to limit how often the angle reference line is redrawn
+        # while it follows the mouse (see pixmapMouseMove)
+        self._pendingRefLineEnd = None
+        self._refLineTimer = QtCore.QTimer(self)
+        self._refLineTimer.setSingleShot(True)
+        self._refLineTimer.setInterval(constants.REFLINEREDRAWINTERVAL)
+        self._refLineTimer.timeout.connect(self._drawPendingRefLine)
 
         # connect buttons
         self.openImageButton.clicked.connect(self.openImage)
@@ -59,8 +80,6 @@ class MainWidget(skeleton.GuiSkeleton):
         self.calcMomentumButton.clicked.connect(self.calcTrackMomentum)
         self.calcDensityButton.clicked.connect(self.calcOptDensity)
         self.calcAngleButton.clicked.connect(self.calcAngle)
-        self.placeMarkerButton.clicked.connect(self.placeMarkerButtonFunc)
-        self.drawRefButton.clicked.connect(self.drawRefButtonFunc)
 
         # connect the scene pixmap's mouse events
         self.scenePixmap.mousePressEvent = self.pixmapMousePress
@@ -68,70 +87,55 @@ class MainWidget(skeleton.GuiSkeleton):
         self.scenePixmap.mouseMoveEvent = self.pixmapMouseMove
 
         # connect other events
+        self.dlLineEdit.textChanged.connect(self._dlChanged)
         self.dlLineEdit.textEdited.connect(self.dLEdited)
         self.markerList.itemSelectionChanged.connect(self.highlightPoint)
 
     ##############################
     # Keypress Event Handler
     ##############################
+    # WASD set the direction of the movement of the selected point (y
+    # increases going down)
+    _NUDGEKEYS = {QtCore.Qt.Key_W: (0, -1), # up
+                  QtCore.Qt.Key_S: (0, 1),  # down
+                  QtCore.Qt.Key_D: (1, 0),  # right
+                  QtCore.Qt.Key_A: (-1, 0)} # left
+    # F/V select the next or previous marker in the marker list
+    _SELECTKEYS = {QtCore.Qt.Key_V: 'selectNext',
+                   QtCore.Qt.Key_F: 'selectPrevious'}
+    # G/H set the currently selected point as the start or end point, and
+    # Delete deletes it
+    _CURRENTMARKERKEYS = {QtCore.Qt.Key_G: 'setStartPoint',
+                          QtCore.Qt.Key_H: 'setEndPoint',
+                          QtCore.Qt.Key_Delete: 'deleteMarker'}
+
     def keyPressEvent(self, event):
         """Handle the key presses that are not hooked up to buttons."""
-
-        # get the currently selected track marker
-        currentPoint = self.markerList.currentItem()
-        # initialize the point movement variables
-        dx, dy = 0, 0
-
-        # check if the Shift key was held
-        if event.modifiers() & QtCore.Qt.ShiftModifier:
-            isShift = True
-        else:
-            isShift = False
-
-        # WASD to set the direction of the movement of the selected point
-        if event.key() == QtCore.Qt.Key_W:
-            dy = -1 # up (y increases going down)
-
-        elif event.key() == QtCore.Qt.Key_S:
-            dy = 1 # down (y increases going down)
-
-        elif event.key() == QtCore.Qt.Key_D:
-            dx = 1 # right
-
-        elif event.key() == QtCore.Qt.Key_A:
-            dx = -1 # left
+        key = event.key()
 
         # if one of WASD was pressed, move the currently selected point
-        if dx or dy:
+        if key in self._NUDGEKEYS:
+            currentPoint = self.markerList.currentItem()
+            if not currentPoint:
+                return
+            dx, dy = self._NUDGEKEYS[key]
             # if shift was held, do a course movement (half the point size, if
             # the point size is more than 2 px), otherwise move the point by
             # 1 px
-            if isShift and self.pointSize >= 2:
+            if (event.modifiers() & QtCore.Qt.ShiftModifier
+                    and self.pointSize >= 2):
                 dx *= self.pointSize / 2
                 dy *= self.pointSize / 2
-            if currentPoint:
-                currentPoint.move(dx, dy)
-        
-        # F/V to select the next or previous marker in the marker list
-        elif event.key() == QtCore.Qt.Key_V:
-            self.markerList.selectNext()
+            currentPoint.move(dx, dy)
 
-        elif event.key() == QtCore.Qt.Key_F:
-            self.markerList.selectPrevious()
+        elif key in self._SELECTKEYS:
+            getattr(self.markerList, self._SELECTKEYS[key])()
 
-        # G/H to set the currently selected point as the start or end point
-        elif event.key() == QtCore.Qt.Key_G:
+        elif key in self._CURRENTMARKERKEYS:
+            currentPoint = self.markerList.currentItem()
             if currentPoint:
-                self.markerList.setStartPoint(currentPoint)
-
-        elif event.key() == QtCore.Qt.Key_H:
-            if currentPoint:
-                self.markerList.setEndPoint(currentPoint)
-
-        # Delete key to delete the currently selected point
-        elif event.key() == QtCore.Qt.Key_Delete:
-            if currentPoint:
-                self.markerList.deleteMarker(currentPoint)
+                getattr(self.markerList, self._CURRENTMARKERKEYS[key])(
+                    currentPoint)
 
     #############################
     # Pixmap Mouse Event Handlers
@@ -144,19 +148,18 @@ class MainWidget(skeleton.GuiSkeleton):
         initialize an image pan. event is a QGraphicsSceneMouseEvent object
         containing the coordinates of the mouse press.
         """
+        pos = event.pos()
 
         # if the track marker placement mode is selected, add a new marker at
         # the location of the mouse press
-        if self.placeMarkerButton.isChecked():
-            self.markerList.addMarker(
-                event.pos().x(), event.pos().y(), 
-                self.pointSize, self.lineWidth, self.scene)
+        if self.placeMarkerAction.isChecked():
+            self.markerList.addMarker(pos.x(), pos.y(), self.scene)
 
         # if angle reference drawing mode is selected, set the initial point
         # of the reference line at the location of the mouse press
-        elif self.drawRefButton.isChecked():
+        elif self.drawRefAction.isChecked():
             self.angleRefLine.setInitialPoint(
-                event.pos().x(), event.pos().y(),
+                pos.x(), pos.y(),
                 self.pointSize, self.lineWidth, self.scene)
 
         # if neither mode is selected, set the initial reference position for
@@ -165,20 +168,24 @@ class MainWidget(skeleton.GuiSkeleton):
         # is to be done using graphics view coordinates so apply the
         # coordinate mapping
         else:
-            self.sceneView.lastMousePos = self.sceneView.mapFromScene(
-                                              event.pos())
+            self.sceneView.lastMousePos = self.sceneView.mapFromScene(pos)
 
     def pixmapMouseRelease(self, event):
         """Set the final point of the angle reference line if it is in the
         process of being drawn. event is a QGraphicsSceneMouseEvent object
         containing the coordinates of the mouse release.
         """
+        pos = event.pos()
 
         # if the reference line is being drawn, set the final point of the
         # reference line at the location of the mouse release 
         if self.angleRefLine.isBeingDrawn():
+            # bring the line up to date with the last mouse move first
+            if self._refLineTimer.isActive():
+                self._refLineTimer.stop()
+                self._drawPendingRefLine()
             self.angleRefLine.setFinalPoint(
-                event.pos().x(), event.pos().y(),
+                pos.x(), pos.y(),
                 self.pointSize, self.lineWidth, self.scene)
 
     def pixmapMouseMove(self, event):
@@ -187,40 +194,55 @@ class MainWidget(skeleton.GuiSkeleton):
         mode is selected, pan the image. event is a QGraphicsSceneMouseEvent
         object containing the coordinates of the mouse position.
         """
+        pos = event.pos()
 
         # if the reference line is being drawn, redraw its line attribute so
-        # that its end matches the current mouse location
+        # that its end matches the current mouse location. Mice can report
+        # moves much faster than the screen refreshes, so the line is redrawn
+        # at most once per REFLINEREDRAWINTERVAL, with the latest position.
         if self.angleRefLine.isBeingDrawn():
-            self.angleRefLine.drawLine(
-                event.pos().x(), event.pos().y(), self.lineWidth, self.scene)
+            self._pendingRefLineEnd = (pos.x(), pos.y())
+            if not self._refLineTimer.isActive():
+                self._refLineTimer.start()
 
         # if neither mode is currently selected, translate the image so that
         # the pixel under the mouse cursor follows the mouse (i.e. pan the
         # image)
-        if not (self.placeMarkerButton.isChecked()
-                or self.drawRefButton.isChecked()):
+        if self.modeActions.checkedAction() is None:
             # get the graphics view's scroll bar objects
             hbar = self.sceneView.horizontalScrollBar()
             vbar = self.sceneView.verticalScrollBar()
             # determine the difference between the current mouse event postion
             # and the previous mouse event position (in graphics view
             # coordinates)
-            delta = self.sceneView.mapFromScene(
-                        event.pos()) - self.sceneView.lastMousePos
+            mousePos = self.sceneView.mapFromScene(pos)
+            delta = mousePos - self.sceneView.lastMousePos
             # store the position of this mouse event
-            self.sceneView.lastMousePos = self.sceneView.mapFromScene(
-                                              event.pos())
+            self.sceneView.lastMousePos = mousePos
             # shift the scroll bars by the difference in mouse event positions
             hbar.setValue(hbar.value() - delta.x())
             vbar.setValue(vbar.value() - delta.y())
 
+    @QtCore.pyqtSlot()
+    def _drawPendingRefLine(self):
+        """Draw the line of the angle reference to the last mouse position
+        recorded by pixmapMouseMove.
+        """
+        if self._pendingRefLineEnd and self.angleRefLine.isBeingDrawn():
+            endX, endY = self._pendingRefLineEnd
+            self.angleRefLine.drawLine(endX, endY, self.lineWidth, self.scene)
+        self._pendingRefLineEnd = None
+
     ##############################
     # File Dialog Event Handlers
     ##############################
+    @QtCore.pyqtSlot()
     def openImage(self, fileName=None):
         """If fileName, a string containing the complete location of an image
         is passed, open that image. Otherwise have the user select the image
         to open via file dialog.
+
+        The image is read in the background, and shown once it has been read.
         """
 
         # if no file name was given, open file dialog to obtain image file name
@@ -229,15 +251,32 @@ class MainWidget(skeleton.GuiSkeleton):
                 None, "Open File", QtCore.QDir.currentPath(),
                 "Images (*.png *.jpg);;All Files (*)")[0]
 
-        # load the image into sceneImage
+        # return if no file was selected
         if not fileName:
-            return False # image not loaded successfully
-        else:
-            image = self.sceneImage.load(fileName)
-        if not image:
+            return
+
+        # read the image into sceneImage in the background
+        task = tasks.BackgroundTask(_readImage, fileName)
+        task.finished.connect(lambda images: self._setImage(fileName, images))
+        task.failed.connect(lambda error: self._setImage(fileName, None))
+        task.start()
+
+    def _setImage(self, fileName, images):
+        """Show an image that has been read by _readImage().
+
+        Parameters:
+        fileName : the file the image was read from,
+        images   : the (image, displayImage) pair returned by _readImage(), or
+                   None if the file couldn't be read as an image.
+
+        Returns:
+        True if the image was set, False otherwise.
+        """
+        if not images:
             self.displayMessage(
                 "NOTICE: Cannot open file as image: {}.".format(fileName))
             return False # image not loaded successfully
+        self.sceneImage, displayImage = images
 
         # store the image file name
         self.imageFileName = fileName
@@ -247,7 +286,7 @@ class MainWidget(skeleton.GuiSkeleton):
             0, 0, self.sceneImage.width(), self.sceneImage.height())
 
         # create a pixmap from the loaded image
-        self.scenePixmap.setPixmap(QtGui.QPixmap.fromImage(self.sceneImage))
+        self.scenePixmap.setPixmap(QtGui.QPixmap.fromImage(displayImage))
 
         # set keyboard focus to the graphics view
         self.sceneView.setFocus()
@@ -258,9 +297,13 @@ class MainWidget(skeleton.GuiSkeleton):
         # an image was successfully opened
         return True
 
+    @QtCore.pyqtSlot()
     def saveSession(self):
         """Save analysis session to a .json file selected by the user via file
         dialog.
+
+        The session data is collected right away, and written to the file in
+        the background.
         """
 
         # if no image has been opened, return
@@ -285,46 +328,42 @@ class MainWidget(skeleton.GuiSkeleton):
             saveData['imageFileName'] = self.imageFileName
 
             # if there are any markers in the marker list, store their data
-            if self.markerList.count() > 0:
-                # store the marker data in a list to preserve order
-                points = []
-                for row in range(self.markerList.count()):
-                    point = self.markerList.item(row)
-                    pointDict = {}
-                    # save the marker designation and the coordinates
-                    pointDict['designation'] = point.designation
-                    pointDict['x'] = point.ellipse.rect().center().x()
-                    pointDict['y'] = point.ellipse.rect().center().y()
-                    points.append(pointDict)
-                saveData["points"] = points
+            points = self.markerList.points()
+            if points:
+                # store the marker designations and coordinates in a list to
+                # preserve order
+                saveData["points"] = [
+                    {'designation': designation, 'x': x, 'y': y}
+                    for x, y, designation in points]
 
             # store the dL if it is not empty or 0
-            if self.dlLineEdit.text() not in ["0", ""]:
+            if self._dl:
                 saveData['dl'] = self.dlLineEdit.text()
 
             # store the coordinates of the initial and final points of the
             # reference line
             if self.angleRefLine.finalPoint:
-                initialPointDict = {}
-                initialPointDict[
-                    'x'] = self.angleRefLine.initialPoint.rect().center().x()
-                initialPointDict[
-                    'y'] = self.angleRefLine.initialPoint.rect().center().y()
-                saveData['refInitialPoint'] = initialPointDict
-                finalPointDict = {}
-                finalPointDict[
-                    'x'] = self.angleRefLine.finalPoint.rect().center().x()
-                finalPointDict[
-                    'y'] = self.angleRefLine.finalPoint.rect().center().y()
-                saveData['refFinalPoint'] = finalPointDict
-
-            # serialize the save data dictionary and save to file
-            with open(fileName, 'w') as saveFile:
-                json.dump(saveData, saveFile, indent=4)
-
+                initialCenter = self.angleRefLine.initialPoint.rect().center()
+                saveData['refInitialPoint'] = {'x': initialCenter.x(),
+                                               'y': initialCenter.y()}
+                finalCenter = self.angleRefLine.finalPoint.rect().center()
+                saveData['refFinalPoint'] = {'x': finalCenter.x(),
+                                             'y': finalCenter.y()}
+
+            # serialize the save data dictionary and save to file in the
+            # background
+            task = tasks.BackgroundTask(_writeSession, fileName, saveData)
+            task.failed.connect(lambda error: self.displayMessage(
+                "NOTICE: Unable to save session: {}".format(error)))
+            task.start()
+
+    @QtCore.pyqtSlot()
     def loadSession(self):
         """Load an analysis session from a .json file selected by the user via
         file dialog.
+
+        The session file and its image are read in the background, and the
+        session is set up once they have been read.
         """
 
         # open file dialog for selecting a file to load from
@@ -336,73 +375,85 @@ class MainWidget(skeleton.GuiSkeleton):
         if not fileName:
             return
 
-        else:
-            # open the file contents
-            with open(fileName, 'r') as loadFile:
-                # try to load the file contents as a JSON formatted object
-                try:
-                    loadData = json.load(loadFile)
-                except:
-                    self.displayMessage("NOTICE: Invalid JSON file: {}".format(
-                                                                     fileName))
-                    return
-
-                # get the image filename from the saved session data
-                imageFileName = loadData.get('imageFileName')
-
-                # if the image filename is missing, return
-                if not imageFileName:
-                    self.displayMessage("NOTICE: No image file name found in saved session data: {}".format(fileName))
-                    return
-
-                # try to open the image. If it fails to open, return
-                opened = self.openImage(imageFileName)
-                if not opened:
-                    return
-
-                # get the track marker data from the saved session
-                points = loadData.get('points')
-                if points:
-                    # add each track marker to the marker list
-                    for point in points:
-                        pointDesignation = point["designation"]
-                        x = point['x']
-                        y = point['y']
-                        addedMarker = self.markerList.addMarker(
-                                          x, y, self.pointSize,
-                                          self.lineWidth, self.scene)
-                        # set the appropriate designation for each marker
-                        addedMarker.setDesignation(pointDesignation)
-
-                # get the dl data from the saved session
-                dl = loadData.get('dl')
-                # if it is a float, set it to the dl text box value
-                try:
-                    float(dl)
-                    self.dlLineEdit.setText(dl)
-                except (ValueError, TypeError):
-                    pass
-
-                # get the data for the initial and final points for the
+        # read the session file and its image in the background
+        task = tasks.BackgroundTask(_readSession, fileName)
+        task.finished.connect(
+            lambda session: self._applySession(fileName, *session))
+        task.failed.connect(lambda error: self.displayMessage(
+            "NOTICE: Unable to load session: {}".format(error)))
+        task.start()
+
+    def _applySession(self, fileName, loadData, images):
+        """Set up a session that has been read by _readSession().
+
+        Parameters:
+        fileName : the session file that was read,
+        loadData : the session data, or None if the file isn't valid JSON,
+        images   : the session's image as returned by _readImage(), or None.
+        """
+        # holding back scene updates until the whole session is loaded
+        with self._batchSceneUpdates():
+            if loadData is None:
+                self.displayMessage("NOTICE: Invalid JSON file: {}".format(
+                                                                 fileName))
+                return
+
+            # get the image filename from the saved session data
+            imageFileName = loadData.get('imageFileName')
+
+            # if the image filename is missing, return
+            if not imageFileName:
+                self.displayMessage("NOTICE: No image file name found in saved session data: {}".format(fileName))
+                return
+
+            # try to open the image. If it fails to open, return
+            opened = self._setImage(imageFileName, images)
+            if not opened:
+                return
+
+            # get the track marker data from the saved session
+            points = loadData.get('points')
+            if points:
+                # add all the track markers to the marker list, with
+                # their designations
+                self.markerList.addMarkersBulk(
+                    [(point['x'], point['y'], point["designation"])
+                     for point in points],
+                    self.scene)
+
+            # get the dl data from the saved session
+            dl = loadData.get('dl')
+            # if it is a float, set it to the dl text box value
+            try:
+                float(dl)
+                self.dlLineEdit.setText(dl)
+            except (ValueError, TypeError):
+                pass
+
+            # get the data for the initial and final points for the
+            # reference line
+            refInitialPoint = loadData.get('refInitialPoint')
+            refFinalPoint = loadData.get('refFinalPoint')
+            if refInitialPoint and refFinalPoint:
+                # set the initial point, line and final point of the
                 # reference line
-                refInitialPoint = loadData.get('refInitialPoint')
-                refFinalPoint = loadData.get('refFinalPoint')
-                if refInitialPoint and refFinalPoint:
-                    # set the initial point, line and final point of the
-                    # reference line
-                    self.angleRefLine.setInitialPoint(
-                        refInitialPoint['x'], refInitialPoint['y'],
-                        self.pointSize, self.lineWidth, self.scene)
-                    self.angleRefLine.drawLine(
-                        refFinalPoint['x'], refFinalPoint['y'],
-                        self.lineWidth, self.scene)
-                    self.angleRefLine.setFinalPoint(
-                        refFinalPoint['x'], refFinalPoint['y'],
-                        self.pointSize, self.lineWidth, self.scene)
-
+                self.angleRefLine.setInitialPoint(
+                    refInitialPoint['x'], refInitialPoint['y'],
+                    self.pointSize, self.lineWidth, self.scene)
+                self.angleRefLine.drawLine(
+                    refFinalPoint['x'], refFinalPoint['y'],
+                    self.lineWidth, self.scene)
+                self.angleRefLine.setFinalPoint(
+                    refFinalPoint['x'], refFinalPoint['y'],
+                    self.pointSize, self.lineWidth, self.scene)
+
+    @QtCore.pyqtSlot()
     def saveScreenshot(self):
         """Save the currently visible part of the graphics scene to an
         image.
+
+        The screenshot is taken right away, and written to the file in the
+        background.
         """
 
         # if no image has been opened, return
@@ -412,8 +463,14 @@ class MainWidget(skeleton.GuiSkeleton):
             return
 
         # grab the currently visible portion of the graphics scene and put it
-        # in a pixmap
-        screenshot = self.sceneView.grab()
+        # in an image (pixmaps can only be used on the GUI thread). An OpenGL
+        # viewport can be read straight from its framebuffer rather than being
+        # rendered again.
+        viewport = self.sceneView.viewport()
+        if isinstance(viewport, QtWidgets.QOpenGLWidget):
+            screenshot = viewport.grabFramebuffer()
+        else:
+            screenshot = self.sceneView.grab().toImage()
 
         # open a file dialog for selecting a file to save to
         fileName = QtWidgets.QFileDialog.getSaveFileName(
@@ -424,17 +481,23 @@ class MainWidget(skeleton.GuiSkeleton):
         if not fileName:
             return
 
-        # try to save the pixmap to the selected file
-        if not screenshot.save(fileName):
-            self.displayMessage("NOTICE: Unable to save screenshot.")
+        # try to save the image to the selected file
+        task = tasks.BackgroundTask(screenshot.save, fileName)
+        task.finished.connect(lambda saved: saved or self.displayMessage(
+            "NOTICE: Unable to save screenshot."))
+        task.failed.connect(lambda error: self.displayMessage(
+            "NOTICE: Unable to save screenshot."))
+        task.start()
 
     ##############################
     # Zoom Events Handlers
     ##############################
+    @QtCore.pyqtSlot()
     def zoomIn(self):
         """Scale the image by ZOOMINFACTOR."""
         self.scaleImage(constants.ZOOMINFACTOR)
 
+    @QtCore.pyqtSlot()
     def zoomOut(self):
         """Scale the image by ZOOMOUTFACTOR."""
         self.scaleImage(constants.ZOOMOUTFACTOR)
@@ -446,16 +509,21 @@ class MainWidget(skeleton.GuiSkeleton):
         # update the current zoom level
         self.zoomFactor = self.zoomFactor * factor
         
-        # scale the graphics view
-        self.sceneView.scale(factor, factor)
-
-        # scale the point size and line width state variables
-        self.pointSize /= factor
-        self.lineWidth /= factor
+        # set the scale of the graphics view to the new zoom level. The whole
+        # transform is set, rather than scaling the current one by factor, so
+        # that rounding errors don't build up as the view is zoomed in and out
+        self.sceneView.setTransform(
+            QtGui.QTransform.fromScale(self.zoomFactor, self.zoomFactor))
+
+        # scale the point size and line width state variables, from their
+        # defaults for the same reason
+        inverseZoom = 1 / self.zoomFactor
+        self.pointSize = constants.DEFAULTPOINTSIZE * inverseZoom
+        self.lineWidth = constants.DEFAULTLINEWIDTH * inverseZoom
 
         # scale all graphics items drawn on the graphics scene
-        # using the updated point size and line width
-        self.markerList.rescale(self.pointSize, self.lineWidth)
+        # using the updated point size and line width (the track markers keep
+        # their size on screen by themselves)
         self.momentumArc.rescale(self.lineWidth)
         self.angleRefLine.rescale(self.pointSize, self.lineWidth)
         if self.tangentLine:
@@ -464,6 +532,7 @@ class MainWidget(skeleton.GuiSkeleton):
     ###################################
     # Calculation Button Event Handlers
     ###################################
+    @QtCore.pyqtSlot()
     def calcTrackMomentum(self):
         """ Perform the 'Calculate Track Momentum' behaviour.
         
@@ -471,37 +540,41 @@ class MainWidget(skeleton.GuiSkeleton):
         radius, momentum, length, and errors are then displayed.  The fitted
         momentum arc is drawn over the image.
         """
+        # the calculation modules are only imported when first needed, to keep
+        # them (and scipy) out of the start up time
+        from traxis.calc import circlefit
+
         # User input checks:
         if self.markerList.count() < 3:
             self.displayMessage("NOTICE: At least 3 points are required to calculate momentum.")
             return
-        if not self.markerList.getStartPoint():
+        startPoint = self.markerList.getStartPoint()
+        if not startPoint:
             self.displayMessage(
                 "NOTICE: Track start point must be selected first.")
             return
-        if not self.markerList.getEndPoint():
+        endPoint = self.markerList.getEndPoint()
+        if not endPoint:
             self.displayMessage(
                 "NOTICE: Track end point must be selected first.")
             return
-        try:
-            dl = float(self.dlLineEdit.text())
-        except ValueError:
-            dl = 0.
+        dl = self._dl
 
         # Do the calculations
-        self.fittedCircle = circlefit.fitCircle(self.markerList)
-        self.fittedCircle['cmRadius'] = self.fittedCircle['radius'] * constants.CMPERPX
-        self.fittedCircle['cmRadiusErr'] = self.fittedCircle['radiusErr'] * constants.CMPERPX
-        self.fittedCircle['cmRadiusCal'] = self.fittedCircle['radius'] * constants.ERRCMPERPX
-
-        startAngle = self.markerList.getStartPoint().getAngle(
-                         (self.fittedCircle['centerX'],
-                          self.fittedCircle['centerY']))
-        spanAngle = self.markerList.getEndPoint().getAngle(
-                        (self.fittedCircle['centerX'], 
-                         self.fittedCircle['centerY']), 
-                        self.markerList.getStartPoint())
-        trackLengthPx = self.fittedCircle['radius'] * spanAngle * (math.pi / 180)
+        # the fit only depends on the marker coordinates, so it is reused if
+        # they haven't changed since the last calculation
+        fitKey = (self.markerList.xs.tobytes(), self.markerList.ys.tobytes())
+        if fitKey != self._fitKey:
+            self.fittedCircle = circlefit.fitCircle(self.markerList)
+            self.fittedCircle['cmRadius'] = self.fittedCircle['radius'] * constants.CMPERPX
+            self.fittedCircle['cmRadiusErr'] = self.fittedCircle['radiusErr'] * constants.CMPERPX
+            self.fittedCircle['cmRadiusCal'] = self.fittedCircle['radius'] * constants.ERRCMPERPX
+            self._fitKey = fitKey
+
+        center = (self.fittedCircle['centerX'], self.fittedCircle['centerY'])
+        startAngle = startPoint.getAngle(center)
+        spanAngle = endPoint.getAngle(center, startPoint)
+        trackLengthPx = self.fittedCircle['radius'] * spanAngle * _DEG2RAD
 
         trackLengthCm = trackLengthPx * constants.CMPERPX
         trackLengthCmErr = trackLengthPx * constants.ERRCMPERPX
@@ -521,38 +594,36 @@ class MainWidget(skeleton.GuiSkeleton):
 
         # Print the calculation results
         # raw circle parameters
-        cParamMessage = """---Fitted Circle---
-        Center (x coord):\t{centerX:.5f} +/- {centerXErr:.5f} [px]           
-        Center (y coord):\t{centerY:.5f} +/- {centerYErr:.5f} [px]
-        Radius (px):\t{radius:.5f} +/- {radiusErr:.5f} [px]
-        Radius (cm):\t{cmRadius:.5f} +/- {cmRadiusErr:.5f} (Stat) +/- {cmRadiusCal:.5f} (Cal) [cm]
-        """
-        self.displayMessage(cParamMessage.format(**self.fittedCircle))
-
-        mMessage = """---Track Momentum---
-        Track Momentum:\t{:.5f} +/- {:.5f} (Stat) +/- {:.5f} (Cal) [MeV/c]
-        """
-        self.displayMessage(mMessage.format(momentum, mStatErr, mCalErr))
-
-        trackLengthMessage = """---Track Length---
-        Track Length (px):\t{:.5f} [px]
-        Track Length (cm):\t{:.5f} +/- {:.5f} [cm]
-        """
-        self.displayMessage(trackLengthMessage.format(
-            trackLengthPx, trackLengthCm, trackLengthCmErr))
-
+        fc = self.fittedCircle
+        self.displayMessage(f"""---Fitted Circle---
+        Center (x coord):\t{fc['centerX']:.5f} +/- {fc['centerXErr']:.5f} [px]           
+        Center (y coord):\t{fc['centerY']:.5f} +/- {fc['centerYErr']:.5f} [px]
+        Radius (px):\t{fc['radius']:.5f} +/- {fc['radiusErr']:.5f} [px]
+        Radius (cm):\t{fc['cmRadius']:.5f} +/- {fc['cmRadiusErr']:.5f} (Stat) +/- {fc['cmRadiusCal']:.5f} (Cal) [cm]
+        """)
+
+        self.displayMessage(f"""---Track Momentum---
+        Track Momentum:\t{momentum:.5f} +/- {mStatErr:.5f} (Stat) +/- {mCalErr:.5f} (Cal) [MeV/c]
+        """)
+
+        self.displayMessage(f"""---Track Length---
+        Track Length (px):\t{trackLengthPx:.5f} [px]
+        Track Length (cm):\t{trackLengthCm:.5f} +/- {trackLengthCmErr:.5f} [cm]
+        """)
+
+    @QtCore.pyqtSlot()
     def calcOptDensity(self):
         """Calculate the optical density of a track and print it to the console.
         """
+        from traxis.calc import optdensity
+
         # Check the user's inputs
-        if not self.momentumArc.centralArc:
+        centralArc = self.momentumArc.centralArc
+        if not centralArc:
             self.displayMessage(
                 "NOTICE: Track momentum must be calculated first.")
             return
-        try:
-            dl = float(self.dlLineEdit.text())
-        except ValueError:
-            dl = 0
+        dl = self._dl
         if dl == 0:
             self.displayMessage("NOTICE: dL must be non-zero.")
             return
@@ -562,13 +633,12 @@ class MainWidget(skeleton.GuiSkeleton):
         # portion of the sceneImage that is covered by the momentum arc
         # note: ArcItems have start and span angles in units of millionths of a
         # degree, so divide them by 1e6
+        spanAngle = centralArc.spanAngle() / 1e6
         blackness, blacknessErr = optdensity.calcBlackness(
             self.sceneImage, self.fittedCircle, dl,
-            self.momentumArc.centralArc.startAngle() / 1e6,
-            self.momentumArc.centralArc.spanAngle() / 1e6)
+            centralArc.startAngle() / 1e6, spanAngle)
 
-        trackLengthPx = self.fittedCircle['radius'] * \
-                 self.momentumArc.centralArc.spanAngle() / 1e6 * (math.pi / 180)
+        trackLengthPx = self.fittedCircle['radius'] * spanAngle * _DEG2RAD
 
         trackLengthCm = trackLengthPx * constants.CMPERPX
         trackLengthCmErr = trackLengthPx * constants.ERRCMPERPX
@@ -579,23 +649,27 @@ class MainWidget(skeleton.GuiSkeleton):
                 (blacknessErr / blackness)**2)**0.5
 
         # print the optical density to the console
-        message = """---Optical Density---
-        Optical density:\t{:.5f} +/- {:.5f} [1/cm] (with dL={})
-        """
-        self.displayMessage(message.format(optDensity, optDensityErr, dl))
+        self.displayMessage(f"""---Optical Density---
+        Optical density:\t{optDensity:.5f} +/- {optDensityErr:.5f} [1/cm] (with dL={dl})
+        """)
 
+    @QtCore.pyqtSlot()
     def calcAngle(self):
         """Calculate the starting angle and print it to the console.
 
         The angle is calculated between the reference angle, and The tangent
         line at the designated start point of the circle.
         """
+        from traxis.calc import anglecalc
+        from traxis.graphics import tangent
+
         # Check user inputs
         if not self.momentumArc.centralArc:
             self.displayMessage(
                 "NOTICE: Track momentum must be calculated first.")
             return
-        if not self.markerList.getStartPoint():
+        startPoint = self.markerList.getStartPoint()
+        if not startPoint:
             self.displayMessage(
                 "NOTICE: Start track point must be selected first.")
             return
@@ -606,7 +680,7 @@ class MainWidget(skeleton.GuiSkeleton):
 
         # Calculations
         tangentLine, tangentErrA, tangentErrB = anglecalc.tangentCalc(
-                          self.fittedCircle, self.markerList.getStartPoint())
+                          self.fittedCircle, startPoint)
         angle, angleErr = anglecalc.openingAngle(tangentLine,
                                                  tangentErrA, tangentErrB,
                                                  self.angleRefLine)
@@ -618,45 +692,43 @@ class MainWidget(skeleton.GuiSkeleton):
                                                self.lineWidth, self.scene)
 
         # print the opening angle to the console
-        message = """---Opening Angle---
-        Opening Angle:\t{:.5f} +/- {:.5f}
-        """
-        self.displayMessage(message.format(angle, angleErr))
-
-    ##############################
-    # Mode Change Event Handlers
-    ##############################
-    def placeMarkerButtonFunc(self):
-        """Ensure that the angle reference drawing mode is not selected at the
-        same time as the track marker placement mode.
-        """
-
-        self.drawRefButton.setChecked(False)
-
-    def drawRefButtonFunc(self):
-        """Ensure that the track marker placement mode is not selected at the
-        same time as the angle reference drawing mode.
-        """
-
-        self.placeMarkerButton.setChecked(False)
+        self.displayMessage(f"""---Opening Angle---
+        Opening Angle:\t{angle:.5f} +/- {angleErr:.5f}
+        """)
 
     ##############################
     # Other Event Handlers
     ##############################
+    @QtCore.pyqtSlot(str)
     def dLEdited(self, newDL):
         """Update the outer and inner arcs of the momentum arc to reflect
         newDL, the new value in the dL text box.
-        """
 
-        # if the dL text box is empty (and so newDL is an empty string),
-        # return
-        if not newDL:
+        The arcs are updated after a short delay, so that typing a number
+        redraws them once rather than for every character.
+        """
+        self._dlTimer.start()
+
+    @QtCore.pyqtSlot()
+    def _applyPendingDL(self):
+        """Update the momentum arc with the last dL edited."""
+        # if the dL text box is empty or doesn't hold a number (yet), leave
+        # the arcs as they are
+        if not self.dlLineEdit.hasAcceptableInput():
             return
 
-        # otherwise convert newDL to a float and update the arcs
-        dl = float(newDL)
-        self.momentumArc.updateArcs(dl)
+        self.momentumArc.updateArcs(self._dl)
 
+    @QtCore.pyqtSlot(str)
+    def _dlChanged(self, text):
+        """Keep self._dl up to date with text, the new contents of the dL
+        text box (0 if it doesn't hold a number).
+        """
+        # the validator only lets numbers in the C locale's format through
+        dl, ok = QtCore.QLocale.c().toDouble(text)
+        self._dl = dl if ok else 0.
+
+    @QtCore.pyqtSlot()
     def highlightPoint(self):
         """Highlight the track marker that is currently selected."""
 
@@ -665,18 +737,21 @@ class MainWidget(skeleton.GuiSkeleton):
     ##############################
     # Reset Event Handler
     ##############################
+    @QtCore.pyqtSlot()
     def reset(self):
         """Remove all graphics items drawn on the graphics scene, clear all
         messages from the console, reset image zoom and reset dL.
         """
 
         # remove all points, arcs and lines from the graphics scene
-        self.markerList.empty()
-        self.angleRefLine.reset()
-        self.momentumArc.reset()
-        if self.tangentLine:
-            self.tangentLine.scene().removeItem(self.tangentLine)
-            self.tangentLine = None
+        with self._batchSceneUpdates():
+            self.markerList.empty()
+            self._fitKey = None
+            self.angleRefLine.reset()
+            self.momentumArc.reset()
+            if self.tangentLine:
+                self.tangentLine.scene().removeItem(self.tangentLine)
+                self.tangentLine = None
 
         # clear the console
         self.consoleTextBrowser.clear()
@@ -684,11 +759,9 @@ class MainWidget(skeleton.GuiSkeleton):
         # reset the dL to 0
         self.dlLineEdit.setText("0")
 
-        # reset any image zoom
-        self.scaleImage(1 / self.zoomFactor)
-
         # scale the image so that it fills as much of the graphics view as it
-        # can without requiring scroll bars
+        # can without requiring scroll bars (or no zoom if there is no image)
+        scaleFactor = 1
         if not self.sceneImage.isNull():
             # determine how many times smaller (or larger) the graphics view
             # height is than the image height. Same for the widths.
@@ -704,26 +777,112 @@ class MainWidget(skeleton.GuiSkeleton):
             else:
                 scaleFactor = widthRatio
 
-            self.scaleImage(scaleFactor)
+        # reset any image zoom and apply the new one in a single rescale,
+        # unless the zoom is already right (e.g. at start up, with no image)
+        factor = scaleFactor / self.zoomFactor
+        if abs(factor - 1) > 1e-6:
+            self.scaleImage(factor)
 
+    @QtCore.pyqtSlot()
     def clearMarkers(self):
         """ Clear the markers from the marker list, leaving everything else
         """
 
         # remove all points and arcs from the graphics scene
-        self.markerList.empty()
-        self.momentumArc.reset()
-        if self.tangentLine:
-            self.tangentLine.scene().removeItem(self.tangentLine)
-            self.tangentLine = None
-
+        with self._batchSceneUpdates():
+            self.markerList.empty()
+            self._fitKey = None
+            self.momentumArc.reset()
+            if self.tangentLine:
+                self.tangentLine.scene().removeItem(self.tangentLine)
+                self.tangentLine = None
 
     ##############################
     # Helper Methods
     ##############################
+    @contextlib.contextmanager
+    def _batchSceneUpdates(self):
+        """Context manager that holds back scene and marker list updates
+        while many graphics items are added or removed, and repaints once at
+        the end.
+
+        The graphics view's viewport doesn't repaint and the marker list's
+        signals are blocked for the duration, then both are restored to their
+        previous state. Nested uses are fine.
+        """
+        viewport = self.sceneView.viewport()
+        updatesEnabled = viewport.updatesEnabled()
+        signalsBlocked = self.markerList.blockSignals(True)
+        viewport.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.markerList.blockSignals(signalsBlocked)
+            viewport.setUpdatesEnabled(updatesEnabled)
+            if not signalsBlocked:
+                # catch up on the selection changes that weren't signalled
+                self.highlightPoint()
+            self.scene.update()
+
     def displayMessage(self, msg):
         """Write msg, a string, along with the message number to the console.
         """
         self.msgNumber += 1
-        msg = "[{}]  {}".format(self.msgNumber, msg)
-        self.consoleTextBrowser.append(msg)
+        self.consoleTextBrowser.appendPlainText(
+            f"[{self.msgNumber}]  {msg}")
+
+
+##############################
+# Background File I/O
+##############################
+# These run on a thread pool thread (see tasks.BackgroundTask), so they must
+# not touch any widgets or graphics items.
+def _readImage(fileName):
+    """Read the image file fileName.
+
+    Returns:
+    the image as read, and a copy converted to the format Qt draws fastest
+    (the image itself keeps the format it was loaded in, since the optical
+    density is calculated from it), or None if the file can't be read as an
+    image.
+    """
+    image = QtGui.QImage()
+    if not image.load(fileName):
+        return None
+    return image, image.convertToFormat(
+        QtGui.QImage.Format_ARGB32_Premultiplied)
+
+
+def _readSession(fileName):
+    """Read the session file fileName, and the image it refers to.
+
+    Returns:
+    loadData : the session data, or None if the file isn't valid JSON,
+    images   : the session's image as returned by _readImage(), or None.
+    """
+    import json
+
+    # open the file contents
+    with open(fileName, 'r') as loadFile:
+        # try to load the file contents as a JSON formatted object
+        try:
+            loadData = json.load(loadFile)
+        except ValueError:
+            return None, None
+
+    imageFileName = loadData.get('imageFileName')
+    if not imageFileName:
+        return loadData, None
+    return loadData, _readImage(imageFileName)
+
+
+def _writeSession(fileName, saveData):
+    """Write the session data saveData to the file fileName, as JSON."""
+    import json
+
+    # json.dump writes the encoded chunks to the file as they are produced,
+    # so the whole document is never held in memory as one string. The save
+    # data can't contain reference cycles, so the encoder needn't keep track
+    # of every dict and list it visits.
+    with open(fileName, 'w') as saveFile:
+        json.dump(saveData, saveFile, indent=4, check_circular=False)
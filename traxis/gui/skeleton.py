@@ -20,9 +20,93 @@
 
 import sys
 import os
+import collections
 from PyQt5 import QtCore, QtGui, QtWidgets
+from traxis import constants
 from traxis.graphics import markers, angleref, fittedarc
 
+# the text, tool tip and shortcut (or None) of a button. attr is the name of
+# the GuiSkeleton attribute the button is stored as.
+_ButtonSpec = collections.namedtuple(
+    '_ButtonSpec', ['attr', 'text', 'toolTip', 'shortcut'])
+
+# buttons of the track marker list segment
+_MARKERLISTBUTTONS = (
+    _ButtonSpec('clearMarkerButton', "Clear Markers",
+                "Clear all the selected points and calculated values", None),
+)
+
+# buttons of the "technical buttons" segment (reset, zoom, calculations)
+_TECHBUTTONS = (
+    _ButtonSpec('resetButton', "Reset",
+                "Reset all the selected points and calculated variables", "R"),
+    _ButtonSpec('zoomInButton', "Zoom In", "Zoom into the picture", "Z"),
+    _ButtonSpec('zoomOutButton', "Zoom Out", "Zoom out from the picture", "X"),
+    _ButtonSpec('calcMomentumButton', "Calculate Track Momentum",
+                "Calculate Track momentum", "M"),
+    _ButtonSpec('calcDensityButton', "Calculate Optical Density",
+                "Calculate Optical Density", "N"),
+    _ButtonSpec('calcAngleButton', "Calculate Angle",
+                "Calculate Opening Angle", "B"),
+)
+
+# buttons of the "user selection" segment (open/save)
+_USERSELECTIONBUTTONS = (
+    _ButtonSpec('openImageButton', "Open Image", "Open image for analysis",
+                "O"),
+    _ButtonSpec('saveSessionButton', "Save", "Save current analysis session",
+                None),
+    _ButtonSpec('loadSessionButton', "Load",
+                "Load a previously saved analysis session", None),
+    _ButtonSpec('screenshotButton', "Save Screenshot",
+                "Take a screenshot of the scroll area contents and save to "
+                "image", None),
+)
+
+# modes of the "user selection" segment. These are checkable actions (see
+# GuiSkeleton._make_mode_actions), each shown by a tool button stored as the
+# spec's attr.
+_MODEACTIONS = (
+    _ButtonSpec('placeMarkerButton', "[Mode] Place Track Markers",
+                "Enter mode for placing markers on loaded image.", "P"),
+    _ButtonSpec('drawRefButton', "[Mode] Draw Angle Reference",
+                "Enter mode for drawing angle reference on loaded image.",
+                "L"),
+)
+
+# size policies shared by the widgets that use them. QSizePolicy is a plain
+# value, so (unlike the validator below) it can be created at import time.
+# fill the available width, but keep to the height of the contents
+_EXPANDINGFIXEDPOLICY = QtWidgets.QSizePolicy(
+    QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+# at least as wide as the contents, and keep to their height
+_MINIMUMFIXEDPOLICY = QtWidgets.QSizePolicy(
+    QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+
+# validator shared by the dL text boxes of all the skeletons (see
+# _dlValidator())
+_DLVALIDATOR = None
+
+
+def _dlValidator():
+    """Return the validator for the dL text box, creating it on first use.
+
+    It isn't created at import time, so that importing this module doesn't
+    create Qt objects before the QApplication exists. Any non-negative number
+    is accepted, with no upper bound or limit on the decimals. The C locale
+    (without group separators) is used, so the validated text is always in
+    the format float() reads.
+    """
+    global _DLVALIDATOR
+    if _DLVALIDATOR is None:
+        dlLocale = QtCore.QLocale.c()
+        dlLocale.setNumberOptions(QtCore.QLocale.RejectGroupSeparator)
+        _DLVALIDATOR = QtGui.QDoubleValidator()
+        _DLVALIDATOR.setBottom(0)
+        _DLVALIDATOR.setNotation(QtGui.QDoubleValidator.StandardNotation)
+        _DLVALIDATOR.setLocale(dlLocale)
+    return _DLVALIDATOR
+
 
 class GuiSkeleton(QtWidgets.QWidget):
 
@@ -45,8 +129,7 @@ class GuiSkeleton(QtWidgets.QWidget):
         self.mainLayout.addWidget(self.topWidget)
         # the top portion should have a fixed height, just big enough to fit
         # all of its contents
-        self.topWidget.setSizePolicy(
-            QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        self.topWidget.setSizePolicy(_EXPANDINGFIXEDPOLICY)
         self.topUiLayout = QtWidgets.QHBoxLayout(self.topWidget)
         # don't add any extra padding around the edges of this layout's widgets
         self.topUiLayout.setContentsMargins(0, 0, 0, 0)
@@ -66,28 +149,74 @@ class GuiSkeleton(QtWidgets.QWidget):
         # layout for the bottom portion of the user interface
         self._add_items(self.topUiLayout,
                         [markerListLayout, 
-                         self._make_vline(), 
+                         self._make_divider(QtWidgets.QFrame.VLine), 
                          techButtonLayout, 
-                         self._make_vline(), 
+                         self._make_divider(QtWidgets.QFrame.VLine), 
                          userSelectionLayout, 
-                         self._make_vline(),
+                         self._make_divider(QtWidgets.QFrame.VLine),
                          consoleLayout,
                          ])
-        self.mainLayout.addWidget(self._make_hline()) # horizontal line
+        self.mainLayout.addWidget(
+            self._make_divider(QtWidgets.QFrame.HLine))
         self.mainLayout.addLayout(bottomUiLayout)
 
 
-    def _make_vline(self):
-        vline = QtWidgets.QFrame(self)  # vertical divider widget
-        vline.setFrameShape(QtWidgets.QFrame.VLine)
-        vline.setFrameShadow(QtWidgets.QFrame.Sunken)
-        return vline
+    def _make_divider(self, shape):
+        """ Return a sunken divider line, where shape is QFrame.VLine or
+        QFrame.HLine.
 
-    def _make_hline(self):
-        hline = QtWidgets.QFrame(self)  # vertical divider widget
-        hline.setFrameShape(QtWidgets.QFrame.HLine)
-        hline.setFrameShadow(QtWidgets.QFrame.Sunken)
-        return hline
+        Plain frames are used rather than stylesheet borders: a stylesheet
+        would make every widget under it be drawn by the (slower) stylesheet
+        style.
+        """
+        divider = QtWidgets.QFrame(self)
+        divider.setFrameShape(shape)
+        divider.setFrameShadow(QtWidgets.QFrame.Sunken)
+        return divider
+
+    def _make_buttons(self, specs):
+        """ Create a push button for each _ButtonSpec in specs, and store it
+        as the attribute of this skeleton named by the spec.
+        """
+        for spec in specs:
+            button = QtWidgets.QPushButton(spec.text, self)
+            # don't focus on buttons when clicked
+            button.setFocusPolicy(QtCore.Qt.NoFocus)
+            button.setToolTip(spec.toolTip)
+            if spec.shortcut is not None:
+                button.setShortcut(QtGui.QKeySequence(spec.shortcut))
+            setattr(self, spec.attr, button)
+
+    def _make_mode_actions(self, specs):
+        """ Create a checkable action for each _ButtonSpec in specs, in the
+        modeActions group, and a tool button showing it.
+
+        At most one mode can be selected at a time, which the action group
+        takes care of. Clicking the selected mode deselects it.
+
+        Returns:
+        the actions, in the order of specs
+        """
+        self.modeActions = QtWidgets.QActionGroup(self)
+        self.modeActions.setExclusionPolicy(
+            QtWidgets.QActionGroup.ExclusionPolicy.ExclusiveOptional)
+        actions = []
+        for spec in specs:
+            action = QtWidgets.QAction(spec.text, self.modeActions)
+            action.setToolTip(spec.toolTip)
+            action.setCheckable(True)
+            if spec.shortcut is not None:
+                action.setShortcut(QtGui.QKeySequence(spec.shortcut))
+
+            button = QtWidgets.QToolButton(self)
+            button.setDefaultAction(action)
+            # fill the width of the segment, like the push buttons do
+            button.setSizePolicy(_EXPANDINGFIXEDPOLICY)
+            # don't focus on buttons when clicked
+            button.setFocusPolicy(QtCore.Qt.NoFocus)
+            setattr(self, spec.attr, button)
+            actions.append(action)
+        return actions
 
     def _add_items(self, layout, items):
         """ Add each widget or layout in items to the layout
@@ -110,18 +239,17 @@ class GuiSkeleton(QtWidgets.QWidget):
 
         self.markerList = markers.MarkerList(self)  # marker list widget
         self.markerList.setMinimumWidth(100)
-        self.markerList.setMaximumWidth(markerListLabel.width()*2)
+        # at most twice as wide as the label's text. The label hasn't been
+        # laid out yet, so its width() is only a placeholder; the font
+        # metrics give the text's actual width.
+        self.markerList.setMaximumWidth(
+            markerListLabel.fontMetrics().horizontalAdvance(
+                markerListLabel.text()) * 2)
         # don't focus on this widget when clicked
         self.markerList.setFocusPolicy(QtCore.Qt.NoFocus)
 
         # clear markers button widget
-        self.clearMarkerButton = QtWidgets.QPushButton(self)
-        # don't focus on this widget when clicked
-        self.clearMarkerButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.clearMarkerButton.setText("Clear Markers")
-        self.clearMarkerButton.setToolTip(
-            "Clear all the selected points and calculated values")
-        # self.clearMarkerButton.setShortcut(QtGui.QKeySequence("C"))
+        self._make_buttons(_MARKERLISTBUTTONS)
 
         self._add_items(markerListLayout, 
                           [markerListLabel, self.markerList, self.clearMarkerButton])
@@ -135,69 +263,23 @@ class GuiSkeleton(QtWidgets.QWidget):
         """
         techButtonLayout = QtWidgets.QVBoxLayout()
 
+        # reset, zoom and calculate button widgets
+        self._make_buttons(_TECHBUTTONS)
+
         resetButtonLabel = QtWidgets.QLabel(self)  # reset button label
         resetButtonLabel.setText("Reset Analysis")
 
-        self.resetButton = QtWidgets.QPushButton(self)  # reset button widget
-        # don't focus on this widget when clicked
-        self.resetButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.resetButton.setText("Reset")
-        self.resetButton.setToolTip(
-            "Reset all the selected points and calculated variables")
-        self.resetButton.setShortcut(QtGui.QKeySequence("R"))
-
         zoomLabel = QtWidgets.QLabel(self)  # zoom label
         zoomLabel.setText("Zoom")
 
         # horizontal layout for zoom buttons
         zoomLayout = QtWidgets.QHBoxLayout()
-
-        # zoom in button widget
-        self.zoomInButton = QtWidgets.QPushButton(self)
-        # don't focus on this widget when clicked
-        self.zoomInButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.zoomInButton.setText("Zoom In")
-        self.zoomInButton.setToolTip("Zoom into the picture")
-        self.zoomInButton.setShortcut(QtGui.QKeySequence("Z"))
-
-        # zoom out button widget
-        self.zoomOutButton = QtWidgets.QPushButton(self)
-        self.zoomOutButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        # don't focus on this widget when clicked
-        self.zoomOutButton.setText("Zoom Out")
-        self.zoomOutButton.setToolTip("Zoom out from the picture")
-        self.zoomOutButton.setShortcut(QtGui.QKeySequence("X"))
-
         zoomLayout.addWidget(self.zoomInButton)
         zoomLayout.addWidget(self.zoomOutButton)
 
         calcLabel = QtWidgets.QLabel(self)  # calculate label
         calcLabel.setText("Calculate")
 
-        # calculate momentum button widget
-        self.calcMomentumButton = QtWidgets.QPushButton(self)
-        # don't focus on this widget when clicked
-        self.calcMomentumButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.calcMomentumButton.setText("Calculate Track Momentum")
-        self.calcMomentumButton.setToolTip("Calculate Track momentum")
-        self.calcMomentumButton.setShortcut(QtGui.QKeySequence("M"))
-
-        # calculate optical density button widget
-        self.calcDensityButton = QtWidgets.QPushButton(self)
-        # don't focus on this widget when clicked
-        self.calcDensityButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.calcDensityButton.setText("Calculate Optical Density")
-        self.calcDensityButton.setToolTip("Calculate Optical Density")
-        self.calcDensityButton.setShortcut(QtGui.QKeySequence("N"))
-
-        # calculate angle button widget
-        self.calcAngleButton = QtWidgets.QPushButton(self)
-        # don't focus on this widget when clicked
-        self.calcAngleButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.calcAngleButton.setText("Calculate Angle")
-        self.calcAngleButton.setToolTip("Calculate Opening Angle")
-        self.calcAngleButton.setShortcut(QtGui.QKeySequence("B"))
-
         self._add_items(techButtonLayout,
                           [resetButtonLabel, 
                            self.resetButton, 
@@ -216,90 +298,39 @@ class GuiSkeleton(QtWidgets.QWidget):
         # user seletion segment layout
         userSelectionLayout = QtWidgets.QVBoxLayout()
 
+        # open, save and screenshot button widgets
+        self._make_buttons(_USERSELECTIONBUTTONS)
+        # place marker and draw angle reference mode actions and buttons
+        self.placeMarkerAction, self.drawRefAction = \
+            self._make_mode_actions(_MODEACTIONS)
+
         openSaveLabel = QtWidgets.QLabel(self)  # open/save label
         openSaveLabel.setText("Open/Save")
 
-        self.openImageButton = QtWidgets.QPushButton(
-            self)  # open image button widget
-        # don't focus on this widget when clicked
-        self.openImageButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.openImageButton.setText("Open Image")
-        self.openImageButton.setToolTip("Open image for analysis")
-        self.openImageButton.setShortcut(QtGui.QKeySequence("O"))
-
         # horizontal layout for save and load buttons
         saveLayout = QtWidgets.QHBoxLayout()
 
-        # save session button widget
-        self.saveSessionButton = QtWidgets.QPushButton(self)
-        # don't focus on this widget when clicked
-        self.saveSessionButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.saveSessionButton.setText("Save")
-        self.saveSessionButton.setToolTip("Save current analysis session")
-        
-        # load session button widget
-        self.loadSessionButton = QtWidgets.QPushButton(self)
-        # don't focus on this widget when clicked
-        self.loadSessionButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.loadSessionButton.setText("Load")
-        self.loadSessionButton.setToolTip(
-            "Load a previously saved analysis session")
-
-        # screenshot button widget
-        self.screenshotButton = QtWidgets.QPushButton(self)
-        # don't focus on this widget when clicked
-        self.screenshotButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.screenshotButton.setText("Save Screenshot")
-        self.screenshotButton.setToolTip(
-            "Take a screenshot of the scroll area contents and save to image")
-
         modeLabel = QtWidgets.QLabel(self) # mode label
         modeLabel.setText("Mode")
 
-        # place marker mode button widget
-        self.placeMarkerButton = QtWidgets.QPushButton(self)
-        # make the button checkable (i.e. stays depressed when clicked)
-        self.placeMarkerButton.setCheckable(True)
-        # don't focus on this widget when clicked
-        self.placeMarkerButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.placeMarkerButton.setText("[Mode] Place Track Markers")
-        self.placeMarkerButton.setToolTip(
-            "Enter mode for placing markers on loaded image.")
-        self.placeMarkerButton.setShortcut("P")
-
-        # draw angle reference mode button widget
-        self.drawRefButton = QtWidgets.QPushButton(self)
-        # make the button checkable (i.e. stays depressed when clicked)
-        self.drawRefButton.setCheckable(True)
-        # don't focus on this widget when clicked
-        self.drawRefButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.drawRefButton.setText("[Mode] Draw Angle Reference")
-        self.drawRefButton.setToolTip(
-            "Enter mode for drawing angle reference on loaded image.")
-        self.drawRefButton.setShortcut("L")
-
-        # dl form layout
-        dlFormLayout = QtWidgets.QFormLayout()
+        # dl layout, with the label beside the text box
+        dlLayout = QtWidgets.QHBoxLayout()
 
         # dl label
         dlLabel = QtWidgets.QLabel(self)
-        dlFormLayout.setWidget(
-            0, QtWidgets.QFormLayout.LabelRole, dlLabel)
         dlLabel.setText("Set dL")
 
         # dl text box (line edit) widget
         self.dlLineEdit = QtWidgets.QLineEdit(self)
         # fix the size of the text box
-        self.dlLineEdit.setSizePolicy(
-            QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
-        dlFormLayout.setWidget(
-            0, QtWidgets.QFormLayout.FieldRole, self.dlLineEdit)
+        self.dlLineEdit.setSizePolicy(_MINIMUMFIXEDPOLICY)
+        dlLayout.addWidget(dlLabel)
+        dlLayout.addWidget(self.dlLineEdit)
         # set the dL value to 0 by default
         self.dlLineEdit.setText("0")
-        # validate the contents of the text box so that only floats can
-        # be entered
-        self.dlLineEdit.setValidator(
-            QtGui.QRegExpValidator(QtCore.QRegExp('[0-9]+\.?[0-9]*')))
+        # validate the contents of the text box so that only non-negative
+        # floats can be entered
+        self.dlLineEdit.setValidator(_dlValidator())
 
         # Add all the widgets and layout
         saveLayout.addWidget(self.saveSessionButton)
@@ -310,7 +341,7 @@ class GuiSkeleton(QtWidgets.QWidget):
                          modeLabel, 
                          self.placeMarkerButton, 
                          self.drawRefButton, 
-                         dlFormLayout, ])
+                         dlLayout, ])
         # add stretch to segment to keep widgets together
         userSelectionLayout.addStretch(0)
         return userSelectionLayout
@@ -322,8 +353,13 @@ class GuiSkeleton(QtWidgets.QWidget):
         consoleLabel = QtWidgets.QLabel(self)  # console label
         consoleLabel.setText("Console")
 
-        # console text browser widget
-        self.consoleTextBrowser = QtWidgets.QTextBrowser(self)
+        # console widget. The messages are plain text, so a QPlainTextEdit
+        # is enough, and its line based layout makes appending cheap.
+        self.consoleTextBrowser = QtWidgets.QPlainTextEdit(self)
+        self.consoleTextBrowser.setReadOnly(True)
+        self.consoleTextBrowser.setUndoRedoEnabled(False)
+        # bound the console's size, however many messages are written
+        self.consoleTextBrowser.setMaximumBlockCount(constants.CONSOLEMAXLINES)
         self.consoleTextBrowser.setMinimumWidth(100)
 
         # Add widgets to layout
@@ -337,22 +373,48 @@ class GuiSkeleton(QtWidgets.QWidget):
         # create a graphics scene on which images and all graphics will be
         # displayed
         self.scene = QtWidgets.QGraphicsScene()
+        # the scene only ever holds a handful of items (the markers are all
+        # drawn by one overlay item), so it doesn't need a BSP item index.
+        # The marker list would switch it off anyway when attached.
+        self.scene.setItemIndexMethod(QtWidgets.QGraphicsScene.NoIndex)
         # the graphics view is the widget that actually displays the contents
         # of the graphics scene
         self.sceneView = QtWidgets.QGraphicsView(self.scene, self)
         # set a minimum size for the scene view
         self.sceneView.setMinimumWidth(900)
         self.sceneView.setMinimumHeight(400)
+        if constants.USEOPENGLVIEWPORT:
+            self.sceneView.setViewport(QtWidgets.QOpenGLWidget())
+        # let the view pick the cheapest way to repaint the changed regions
+        self.sceneView.setViewportUpdateMode(
+            QtWidgets.QGraphicsView.SmartViewportUpdate)
+        # every graphics item sets up its own pen and brush when painting, so
+        # the view doesn't need to save and restore the painter around them
+        self.sceneView.setOptimizationFlag(
+            QtWidgets.QGraphicsView.DontSavePainterState)
+        # nothing is drawn antialiased, so the exposed regions don't need the
+        # extra margin
+        self.sceneView.setOptimizationFlag(
+            QtWidgets.QGraphicsView.DontAdjustForAntialiasing)
 
         # instantiate QImage and PixmapItem
         self.sceneImage = QtGui.QImage()
         self.scenePixmap = QtWidgets.QGraphicsPixmapItem()
+        # draw the image unfiltered when zoomed, so each image pixel stays a
+        # sharp square to place markers on (this is also the cheapest mode)
+        self.scenePixmap.setTransformationMode(QtCore.Qt.FastTransformation)
+        # the pixmap receives all the mouse presses on the image. Hit test
+        # them against its rect, rather than a mask built from the image's
+        # alpha channel.
+        self.scenePixmap.setShapeMode(
+            QtWidgets.QGraphicsPixmapItem.BoundingRectShape)
         self.scene.addItem(self.scenePixmap)
 
-        # instantiate reference line and momentum arc objects
+        # instantiate reference line and momentum arc objects. Their graphics
+        # items are only created once they are drawn.
         self.angleRefLine = angleref.ReferenceLine()
         self.momentumArc = fittedarc.MomentumArc()
- 
+
         # set the tangentLine attribute to None initially so that there is
         # something to check for when a tangent has not been drawn yet
         self.tangentLine = None
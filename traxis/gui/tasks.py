@@ -0,0 +1,90 @@
+# Copyright (C) 2014 Syed Haider Abidi, Nooruddin Ahmed and Christopher Dydula
+#
+# This file is part of traxis.
+#
+# traxis is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# traxis is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with traxis.  If not, see <http://www.gnu.org/licenses/>.
+
+from PyQt5 import QtCore
+
+
+class BackgroundTask(QtCore.QObject):
+    """Run a function on a thread of the global QThreadPool.
+
+    This is used for slow file I/O (reading images and sessions, writing
+    sessions and screenshots), so the GUI keeps responding in the meantime.
+    The function must not touch any widgets or graphics items: it should only
+    do the I/O and return what it read. The result is then handed back on the
+    GUI thread, where it can be applied.
+    """
+
+    # emitted with the function's return value, or with the exception it
+    # raised. Since the task object lives in the GUI thread, the signals are
+    # queued and the connected slots run on the GUI thread.
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(object)
+
+    # tasks that have been started but haven't finished yet. Keeping a
+    # reference stops them from being garbage collected while running.
+    _running = set()
+
+    def __init__(self, function, *args):
+        """ Create a task that will call function(*args).
+
+        Parameters:
+        function : the function to run in the background,
+        args     : the arguments to pass to function.
+        """
+        super().__init__()
+        self._function = function
+        self._args = args
+
+    def start(self):
+        """Queue the task on the global thread pool.
+
+        Connect to the finished and failed signals before calling this.
+        """
+        BackgroundTask._running.add(self)
+        # connected last, so the task is only released (on the GUI thread)
+        # once the other slots have run
+        self.finished.connect(self._release)
+        self.failed.connect(self._release)
+        QtCore.QThreadPool.globalInstance().start(_TaskRunnable(self))
+
+    def _run(self):
+        """Call the function and emit its result. Runs on the pool thread."""
+        try:
+            result = self._function(*self._args)
+        except Exception as error:
+            self.failed.emit(error)
+        else:
+            self.finished.emit(result)
+
+    def _release(self):
+        """Drop the reference to the finished task."""
+        BackgroundTask._running.discard(self)
+
+
+class _TaskRunnable(QtCore.QRunnable):
+    """QRunnable wrapper for a BackgroundTask.
+
+    BackgroundTask can't subclass both QObject (for its signals) and
+    QRunnable, so the thread pool is given this instead.
+    """
+
+    def __init__(self, task):
+        super().__init__()
+        self._task = task
+
+    def run(self):
+        self._task._run()